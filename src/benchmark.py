@@ -0,0 +1,248 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import tempfile
+import time
+from crawler import parse_page, build_link_graph
+from indexer import build_inverted_index
+from pagerank import calculate_sparse_pagerank, calculate_topic_pageranks
+from hits import calculate_hits
+from search import search_with_ranking, process_query
+from instrumentation import latency_summary
+from utils import save_json_data, get_data_path
+
+SYNTHETIC_HOSTS = [
+    'arxiv.org',
+    'huggingface.co',
+    'kaggle.com',
+    'paperswithcode.com',
+    'research.google',
+    'medium.com'
+]
+
+MAX_SUPPORTED_DOCS = 100000
+
+RANKING_MODES = {
+    '1': 'tfidf',
+    '2': 'tfidf_pagerank',
+    '3': 'tfidf_hits',
+    '4': 'tfidf_topic_pagerank',
+    '5': 'tfidf_impact'
+}
+
+class ByteCounter:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, chunk):
+        self.size += len(chunk.encode('utf-8'))
+
+def serialized_size(data):
+    counter = ByteCounter()
+    json.dump(data, counter)
+    return counter.size
+
+def generate_vocabulary(size, rng):
+    vocabulary = set()
+    while len(vocabulary) < size:
+        length = rng.randint(4, 10)
+        vocabulary.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return sorted(vocabulary)
+
+def zipf_cumulative_weights(size, exponent=1.1):
+    return list(itertools.accumulate(1.0 / (rank + 1) ** exponent for rank in range(size)))
+
+def generate_synthetic_corpus(num_docs, vocabulary, rng, doc_length=200):
+    cum_weights = zipf_cumulative_weights(len(vocabulary))
+    base_timestamp = 1735689600
+    pages = []
+
+    for doc_id in range(num_docs):
+        length = rng.randint(doc_length // 2, doc_length * 3 // 2)
+        host = rng.choice(SYNTHETIC_HOSTS)
+        pages.append({
+            'url': f"https://{host}/doc/{doc_id}",
+            'title': ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=5)),
+            'content': ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=length)),
+            'links': [],
+            'crawl_timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(base_timestamp + doc_id * 60))
+        })
+
+    return pages
+
+def generate_power_law_links(pages, rng, out_degree=5):
+    attachment_pool = []
+
+    for doc_id, page in enumerate(pages):
+        targets = set()
+        for _ in range(min(out_degree, doc_id)):
+            if attachment_pool and rng.random() < 0.8:
+                targets.add(rng.choice(attachment_pool))
+            else:
+                targets.add(rng.randrange(doc_id))
+
+        page['links'] = [pages[target]['url'] for target in targets]
+        attachment_pool.extend(targets)
+        attachment_pool.append(doc_id)
+
+    return build_link_graph(pages)
+
+def write_html_fixtures(pages, directory):
+    fixtures = []
+    for doc_id, page in enumerate(pages):
+        anchors = ''.join(f'<a href="{link}">link</a>' for link in page['links'])
+        html = (f"<html><head><title>{page['title']}</title><style>p {{}}</style></head>"
+                f"<body><p>{page['content']}</p>{anchors}</body></html>")
+
+        path = os.path.join(directory, f"doc_{doc_id}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        fixtures.append((path, page['url']))
+    return fixtures
+
+def generate_queries(vocabulary, rng, count):
+    candidates = vocabulary[10:min(len(vocabulary), 500)]
+    return [' '.join(rng.sample(candidates, rng.randint(1, 3))) for _ in range(count)]
+
+def benchmark_parsing(pages, num_fixtures):
+    directory = tempfile.mkdtemp(prefix='search_bench_')
+    try:
+        fixtures = write_html_fixtures(pages[:num_fixtures], directory)
+        documents = []
+        for path, url in fixtures:
+            with open(path, 'rb') as f:
+                documents.append((f.read(), url))
+
+        start_time = time.perf_counter()
+        for html, url in documents:
+            parse_page(html, url)
+        elapsed = time.perf_counter() - start_time
+
+        total_bytes = sum(len(html) for html, _ in documents)
+        return {
+            'pages': len(documents),
+            'seconds': elapsed,
+            'pages_per_second': len(documents) / elapsed if elapsed > 0 else 0,
+            'mb_per_second': total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def benchmark_corpus(num_docs, seed, num_queries, max_hits_nodes, num_fixtures):
+    rng = random.Random(seed)
+    vocabulary = generate_vocabulary(max(1000, min(num_docs * 5, 50000)), rng)
+    pages = generate_synthetic_corpus(num_docs, vocabulary, rng)
+    link_graph = generate_power_law_links(pages, rng)
+    queries = generate_queries(vocabulary, rng, num_queries)
+
+    result = {
+        'documents': num_docs,
+        'vocabulary_size': len(vocabulary),
+        'edges': sum(len(targets) for targets in link_graph['edges'].values()),
+        'parsing': benchmark_parsing(pages, min(num_fixtures, num_docs))
+    }
+
+    start_time = time.perf_counter()
+    index_data = build_inverted_index(pages)
+    result['index'] = {
+        'build_seconds': time.perf_counter() - start_time,
+        'unique_terms': len(index_data['index']),
+        'size_bytes': serialized_size(index_data)
+    }
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.perf_counter()
+        topic_pagerank = calculate_topic_pageranks(link_graph)
+    result['topic_pagerank'] = {'seconds': time.perf_counter() - start_time,
+                                'topics': len(topic_pagerank['topics'])}
+    topic_pagerank['url_to_row'] = {url: i for i, url in enumerate(topic_pagerank['nodes'])}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.perf_counter()
+        pagerank_scores = calculate_sparse_pagerank(link_graph)
+    result['pagerank'] = {'seconds': time.perf_counter() - start_time}
+
+    hits_fits = num_docs <= max_hits_nodes
+    if hits_fits:
+        hits_latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for query in queries:
+                start_time = time.perf_counter()
+                calculate_hits(process_query(query), link_graph, index_data)
+                hits_latencies.append(time.perf_counter() - start_time)
+        result['hits'] = latency_summary(hits_latencies)
+    else:
+        result['hits'] = {'skipped': f"corpus larger than max_hits_nodes={max_hits_nodes}"}
+
+    result['query_latency'] = {}
+    for mode, mode_name in RANKING_MODES.items():
+        if mode == '3' and not hits_fits:
+            result['query_latency'][mode_name] = result['hits']
+            continue
+
+        latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for query in queries:
+                start_time = time.perf_counter()
+                search_with_ranking(query, mode, pages, index_data, pagerank_scores, link_graph, topic_pagerank)
+                latencies.append(time.perf_counter() - start_time)
+        result['query_latency'][mode_name] = latency_summary(latencies)
+
+    return result
+
+def run_benchmarks(corpus_sizes, seed=42, num_queries=50, max_hits_nodes=2000, num_fixtures=200):
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'corpus_sizes': corpus_sizes,
+            'seed': seed,
+            'num_queries': num_queries,
+            'max_hits_nodes': max_hits_nodes,
+            'num_fixtures': num_fixtures
+        },
+        'runs': [benchmark_corpus(num_docs, seed, num_queries, max_hits_nodes, num_fixtures)
+                 for num_docs in corpus_sizes]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search engine on synthetic corpora")
+    parser.add_argument('--docs', type=int, nargs='+', default=[1000, 10000],
+                        help=f"corpus sizes to benchmark, up to {MAX_SUPPORTED_DOCS} "
+                             "(the in-memory index peaks near 4 GB at that size)")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-hits-nodes', type=int, default=2000,
+                        help="only time HITS up to this corpus size (per-query subgraph scan is quadratic)")
+    parser.add_argument('--fixtures', type=int, default=200, help="HTML fixtures to parse per corpus")
+    parser.add_argument('--output', default=get_data_path('benchmark_results.json'))
+    args = parser.parse_args()
+    if max(args.docs) > MAX_SUPPORTED_DOCS:
+        parser.error(f"--docs above {MAX_SUPPORTED_DOCS} does not fit in memory")
+
+    results = run_benchmarks(args.docs, args.seed, args.queries, args.max_hits_nodes, args.fixtures)
+    save_json_data(results, args.output)
+
+    for run in results['runs']:
+        print(f"\n=== {run['documents']} documents ===")
+        print(f"Parsing: {run['parsing']['pages_per_second']:.1f} pages/s")
+        print(f"Index build: {run['index']['build_seconds']:.2f}s, "
+              f"{run['index']['size_bytes'] / (1024 * 1024):.1f} MB")
+        if 'seconds' in run['pagerank']:
+            print(f"PageRank: {run['pagerank']['seconds']:.2f}s")
+        for mode_name, latency in run['query_latency'].items():
+            if 'p50_ms' in latency:
+                print(f"{mode_name}: p50 {latency['p50_ms']:.2f}ms, p99 {latency['p99_ms']:.2f}ms")
+
+    print(f"\nSaved results to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import math
+import re
+from utils import load_json_data
+from indexer import preprocess_text, build_postings_lists
+from ranker import compute_idf, rank_documents
+
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+def tokenize_query(query_text):
+    return re.findall(r'\(|\)|[^\s()]+', query_text)
+
+def is_boolean_query(query_text):
+    return any(token in OPERATORS or token in ('(', ')') for token in tokenize_query(query_text))
+
+def drop_unmatched_parens(tokens):
+    depth = 0
+    balanced = []
+    for token in tokens:
+        if token == ')':
+            if depth == 0:
+                continue
+            depth -= 1
+        elif token == '(':
+            depth += 1
+        balanced.append(token)
+    return balanced
+
+def parse_query(query_text):
+    tokens = drop_unmatched_parens(tokenize_query(query_text))
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def advance():
+        nonlocal position
+        token = tokens[position]
+        position += 1
+        return token
+
+    def parse_or():
+        children = [parse_and()]
+        while peek() == 'OR':
+            advance()
+            children.append(parse_and())
+        return make_node('OR', children)
+
+    def parse_and():
+        children = [parse_not()]
+        while peek() is not None and peek() not in ('OR', ')'):
+            if peek() == 'AND':
+                advance()
+            children.append(parse_not())
+        return make_node('AND', children)
+
+    def parse_not():
+        if peek() == 'NOT':
+            advance()
+            child = parse_not()
+            return ('NOT', child) if child is not None else None
+        return parse_primary()
+
+    def parse_primary():
+        token = peek()
+        if token is None or token in ('AND', 'OR', ')'):
+            return None
+        advance()
+        if token == '(':
+            node = parse_or()
+            if peek() == ')':
+                advance()
+            return node
+        terms = preprocess_text(token)
+        return make_node('AND', [('TERM', term) for term in terms])
+
+    if not tokens:
+        return None
+
+    return parse_or()
+
+def make_node(operator, children):
+    children = [child for child in children if child is not None]
+    if not children:
+        return None
+    if len(children) == 1:
+        return children[0]
+    return (operator, children)
+
+def collect_query_terms(node, negated=False):
+    if node is None:
+        return []
+    if node[0] == 'TERM':
+        return [] if negated else [node[1]]
+    if node[0] == 'NOT':
+        return collect_query_terms(node[1], not negated)
+
+    terms = []
+    for child in node[1]:
+        for term in collect_query_terms(child, negated):
+            if term not in terms:
+                terms.append(term)
+    return terms
+
+def skip_interval(length):
+    return max(1, int(math.sqrt(length)))
+
+def skip_to(doc_ids, position, target, skip, stats):
+    next_skip = (position // skip + 1) * skip
+    while next_skip < len(doc_ids) and doc_ids[next_skip] <= target:
+        stats['postings_touched'] += 1
+        position = next_skip
+        next_skip += skip
+
+    while position < len(doc_ids) and doc_ids[position] < target:
+        stats['postings_touched'] += 1
+        position += 1
+
+    return position
+
+def intersect_postings(p1, p2, stats):
+    answer = []
+    i = j = 0
+    skip1 = skip_interval(len(p1))
+    skip2 = skip_interval(len(p2))
+
+    while i < len(p1) and j < len(p2):
+        stats['postings_touched'] += 1
+        if p1[i] == p2[j]:
+            answer.append(p1[i])
+            i += 1
+            j += 1
+        elif p1[i] < p2[j]:
+            i = skip_to(p1, i, p2[j], skip1, stats)
+        else:
+            j = skip_to(p2, j, p1[i], skip2, stats)
+
+    return answer
+
+def union_postings(p1, p2, stats):
+    answer = []
+    i = j = 0
+
+    while i < len(p1) and j < len(p2):
+        stats['postings_touched'] += 1
+        if p1[i] == p2[j]:
+            answer.append(p1[i])
+            i += 1
+            j += 1
+        elif p1[i] < p2[j]:
+            answer.append(p1[i])
+            i += 1
+        else:
+            answer.append(p2[j])
+            j += 1
+
+    stats['postings_touched'] += (len(p1) - i) + (len(p2) - j)
+    answer.extend(p1[i:])
+    answer.extend(p2[j:])
+    return answer
+
+def difference_postings(p1, p2, stats):
+    answer = []
+    i = j = 0
+    skip2 = skip_interval(len(p2))
+
+    while i < len(p1):
+        stats['postings_touched'] += 1
+        if j >= len(p2) or p1[i] < p2[j]:
+            answer.append(p1[i])
+            i += 1
+        elif p1[i] == p2[j]:
+            i += 1
+            j += 1
+        else:
+            j = skip_to(p2, j, p1[i], skip2, stats)
+
+    return answer
+
+def estimate_size(node, postings):
+    if node[0] == 'TERM':
+        return len(postings.get(node[1], []))
+    if node[0] == 'AND':
+        sizes = [estimate_size(child, postings) for child in node[1] if child[0] != 'NOT']
+        return min(sizes) if sizes else float('inf')
+    if node[0] == 'OR':
+        return sum(estimate_size(child, postings) for child in node[1])
+    return float('inf')
+
+def evaluate_node(node, postings, total_docs, stats):
+    if node[0] == 'TERM':
+        return postings.get(node[1], [])
+
+    if node[0] == 'NOT':
+        universe = list(range(total_docs))
+        return difference_postings(universe, evaluate_node(node[1], postings, total_docs, stats), stats)
+
+    if node[0] == 'OR':
+        result = []
+        for child in node[1]:
+            result = union_postings(result, evaluate_node(child, postings, total_docs, stats), stats)
+        return result
+
+    positive = [child for child in node[1] if child[0] != 'NOT']
+    negative = [child[1] for child in node[1] if child[0] == 'NOT']
+
+    if positive:
+        positive.sort(key=lambda child: estimate_size(child, postings))
+        result = evaluate_node(positive[0], postings, total_docs, stats)
+        for child in positive[1:]:
+            if not result:
+                return []
+            result = intersect_postings(result, evaluate_node(child, postings, total_docs, stats), stats)
+    else:
+        result = list(range(total_docs))
+
+    for child in negative:
+        if not result:
+            return []
+        result = difference_postings(result, evaluate_node(child, postings, total_docs, stats), stats)
+
+    return result
+
+def get_posting(term_postings, doc_id):
+    if doc_id in term_postings:
+        return term_postings[doc_id]
+    return term_postings.get(str(doc_id))
+
+def score_candidates(query_terms, candidate_docs, index_data):
+    index = index_data['index']
+    document_frequencies = index_data['document_frequencies']
+    total_docs = index_data['total_documents']
+
+    doc_scores = {doc_id: 0.0 for doc_id in candidate_docs}
+
+    for term in query_terms:
+        if term in index:
+            idf = compute_idf(term, document_frequencies, total_docs)
+            term_postings = index[term]
+
+            for doc_id in candidate_docs:
+                doc_info = get_posting(term_postings, doc_id)
+                if doc_info:
+                    doc_scores[doc_id] += doc_info['tf'] * idf
+
+    return doc_scores
+
+def search_boolean(query_text, index_data, stats=None, doc_mask=None):
+    if stats is None:
+        stats = {}
+    stats['postings_touched'] = 0
+
+    node = parse_query(query_text)
+    if node is None:
+        return []
+
+    if 'postings' not in index_data:
+        index_data['postings'] = build_postings_lists(index_data['index'])
+
+    candidate_docs = evaluate_node(node, index_data['postings'], index_data['total_documents'], stats)
+    if doc_mask is not None:
+        candidate_docs = [doc_id for doc_id in candidate_docs if doc_mask[doc_id]]
+    stats['candidates'] = len(candidate_docs)
+
+    scores = score_candidates(collect_query_terms(node), candidate_docs, index_data)
+    return rank_documents(scores)
+
+def main():
+    index_data = load_json_data('inverted_index.json')
+    if not index_data:
+        print("No index found. Run src/indexer.py first.")
+        return
+
+    while True:
+        query = input("\nEnter boolean query, e.g. (deep OR neural) AND NOT vision (or 'quit' to exit): ").strip()
+        if query.lower() == 'quit':
+            break
+
+        stats = {}
+        results = search_boolean(query, index_data, stats)
+        total_postings = sum(len(doc_ids) for doc_ids in index_data['postings'].values())
+
+        print(f"\n{len(results)} matching documents "
+              f"({stats.get('postings_touched', 0)} of {total_postings} postings touched)")
+        for i, (doc_id, score) in enumerate(results[:10], 1):
+            print(f"{i}. doc {doc_id}: {score:.4f}")
+
+if __name__ == "__main__":
+    main()
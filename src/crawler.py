@@ -4,39 +4,50 @@ from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 import time
 import logging
+import instrumentation
 from utils import normalize_url, extract_text_content, safe_request, setup_logging
 
 def fetch_page(url):
     logger = logging.getLogger(__name__)
     
-    if not respect_robots_txt(url):
+    with instrumentation.span('crawler.robots'):
+        allowed = respect_robots_txt(url)
+    if not allowed:
         logger.info(f"Robots.txt disallows crawling: {url}")
+        instrumentation.increment('crawler.robots_disallowed')
         return None
     
-    response = safe_request(url)
+    with instrumentation.span('crawler.fetch'):
+        response = safe_request(url)
     if not response:
+        instrumentation.increment('crawler.fetch_failed')
         return None
     
+    instrumentation.increment('crawler.bytes_fetched', len(response.content))
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        title_tag = soup.find('title')
-        title = title_tag.get_text().strip() if title_tag else ""
-        
-        content = extract_text_content(soup)
-        links = extract_links(soup, url)
-        
-        return {
-            'url': url,
-            'title': title,
-            'content': content,
-            'links': links,
-            'crawl_timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
+        with instrumentation.span('crawler.parse'):
+            return parse_page(response.content, url)
     except Exception as e:
         logger.error(f"Error parsing page {url}: {e}")
         return None
 
+def parse_page(html, url):
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    title_tag = soup.find('title')
+    title = title_tag.get_text().strip() if title_tag else ""
+    
+    content = extract_text_content(soup)
+    links = extract_links(soup, url)
+    
+    return {
+        'url': url,
+        'title': title,
+        'content': content,
+        'links': links,
+        'crawl_timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }
+
 def extract_links(soup, base_url):
     links = []
     for link in soup.find_all('a', href=True):
@@ -77,30 +88,31 @@ def is_valid_domain(url):
     
 from collections import deque
 
-def crawl_pages(seed_urls, max_pages=50, max_depth=3):
+def iter_crawl(seed_urls, max_pages=50, max_depth=3):
     logger = setup_logging()
     
     url_queue = deque()
     visited_urls = set()
-    crawled_pages = []
+    pages_crawled = 0
     
     for url in seed_urls:
         url_queue.append((url, 0))
     
     logger.info(f"Starting crawl with {len(seed_urls)} seed URLs")
     
-    while url_queue and len(crawled_pages) < max_pages:
+    while url_queue and pages_crawled < max_pages:
         current_url, depth = url_queue.popleft()
         
         if current_url in visited_urls or depth > max_depth:
             continue
         
         visited_urls.add(current_url)
-        logger.info(f"Crawling ({len(crawled_pages)+1}/{max_pages}): {current_url}")
+        logger.info(f"Crawling ({pages_crawled+1}/{max_pages}): {current_url}")
         
         page_data = fetch_page(current_url)
         if page_data:
-            crawled_pages.append(page_data)
+            pages_crawled += 1
+            yield page_data
             
             if depth < max_depth:
                 for link in page_data['links']:
@@ -109,10 +121,13 @@ def crawl_pages(seed_urls, max_pages=50, max_depth=3):
         
         time.sleep(1.5)
     
-    logger.info(f"Crawling completed. Total pages: {len(crawled_pages)}")
-    return crawled_pages
+    logger.info(f"Crawling completed. Total pages: {pages_crawled}")
+
+def crawl_pages(seed_urls, max_pages=50, max_depth=3):
+    return list(iter_crawl(seed_urls, max_pages, max_depth))
     
 from utils import save_json_data
+from docstore import write_docstore
 
 def build_link_graph(crawled_pages):
     all_urls = {page['url'] for page in crawled_pages}
@@ -130,22 +145,26 @@ def build_link_graph(crawled_pages):
         'edges': edges
     }
 
+SEED_URLS = [
+    'https://www.kaggle.com/discussions',
+    'https://paperswithcode.com',
+    'https://huggingface.co/blog',
+    'https://ai.googleblog.com'
+]
+
 def main():
-    seed_urls = [
-        'https://www.kaggle.com/discussions',
-        'https://paperswithcode.com',
-        'https://huggingface.co/blog',
-        'https://ai.googleblog.com'
-    ]
+    crawled_data = crawl_pages(SEED_URLS, max_pages=50, max_depth=2)
     
-    crawled_data = crawl_pages(seed_urls, max_pages=50, max_depth=2)
-    
-    save_json_data(crawled_data, 'crawled_pages.json')
-    print(f"Saved {len(crawled_data)} pages to data/crawled_pages.json")
+    write_docstore(crawled_data)
+    print(f"Saved {len(crawled_data)} pages to data/docstore.bin")
     
     link_graph = build_link_graph(crawled_data)
     save_json_data(link_graph, 'link_graph.json')
     print(f"Saved link graph with {len(link_graph['nodes'])} nodes to data/link_graph.json")
+    
+    if instrumentation.enabled:
+        instrumentation.export_stats('crawler_instrumentation_stats.json')
+        print("Saved instrumentation stats to data/crawler_instrumentation_stats.json")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
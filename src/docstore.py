@@ -0,0 +1,115 @@
+import json
+import os
+import zlib
+from collections import OrderedDict
+from utils import get_data_path, load_json_data, save_json_data
+
+DOCSTORE_PATH = get_data_path('docstore.bin')
+DOCSTORE_INDEX_PATH = get_data_path('docstore_index.json')
+BLOCK_SIZE = 64
+CACHE_BLOCKS = 8
+
+def compress_block(pages):
+    return zlib.compress(json.dumps(pages, ensure_ascii=False).encode('utf-8'), 6)
+
+def write_docstore(pages, block_size=BLOCK_SIZE, path=DOCSTORE_PATH, index_path=DOCSTORE_INDEX_PATH):
+    offsets = [0]
+    urls = []
+    block = []
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        for page in pages:
+            block.append(page)
+            urls.append(page['url'])
+            if len(block) == block_size:
+                offsets.append(offsets[-1] + f.write(compress_block(block)))
+                block = []
+
+        if block:
+            offsets.append(offsets[-1] + f.write(compress_block(block)))
+
+    save_json_data({
+        'block_size': block_size,
+        'total_documents': len(urls),
+        'offsets': offsets,
+        'urls': urls
+    }, index_path)
+
+    return len(urls)
+
+class DocStore:
+    def __init__(self, path=DOCSTORE_PATH, index_path=DOCSTORE_INDEX_PATH):
+        store_index = load_json_data(index_path)
+        self.path = path
+        self.block_size = store_index['block_size']
+        self.total_documents = store_index['total_documents']
+        self.offsets = store_index['offsets']
+        self.urls = store_index['urls']
+        self.cache = OrderedDict()
+
+    def __len__(self):
+        return self.total_documents
+
+    def __bool__(self):
+        return self.total_documents > 0
+
+    def read_block(self, block_id):
+        if block_id in self.cache:
+            self.cache.move_to_end(block_id)
+            return self.cache[block_id]
+
+        start, end = self.offsets[block_id], self.offsets[block_id + 1]
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            block = json.loads(zlib.decompress(f.read(end - start)).decode('utf-8'))
+
+        self.cache[block_id] = block
+        if len(self.cache) > CACHE_BLOCKS:
+            self.cache.popitem(last=False)
+        return block
+
+    def __getitem__(self, doc_id):
+        if doc_id < 0 or doc_id >= self.total_documents:
+            raise IndexError(doc_id)
+        return self.read_block(doc_id // self.block_size)[doc_id % self.block_size]
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            for block_id in range(len(self.offsets) - 1):
+                start, end = self.offsets[block_id], self.offsets[block_id + 1]
+                f.seek(start)
+                yield from json.loads(zlib.decompress(f.read(end - start)).decode('utf-8'))
+
+    def url(self, doc_id):
+        return self.urls[doc_id]
+
+def docstore_exists():
+    return os.path.exists(DOCSTORE_PATH) and os.path.exists(DOCSTORE_INDEX_PATH)
+
+def load_documents():
+    if docstore_exists():
+        return DocStore()
+    return load_json_data('crawled_pages.json')
+
+def get_document_url(documents, doc_id):
+    if isinstance(documents, DocStore):
+        return documents.url(doc_id)
+    return documents[doc_id]['url']
+
+def main():
+    crawled_data = load_json_data('crawled_pages.json')
+    if not crawled_data:
+        print("No crawled data found. Run src/crawler.py first.")
+        return
+
+    count = write_docstore(crawled_data)
+    json_size = os.path.getsize(get_data_path('crawled_pages.json'))
+    store_size = os.path.getsize(DOCSTORE_PATH) + os.path.getsize(DOCSTORE_INDEX_PATH)
+
+    print(f"Wrote {count} documents to data/docstore.bin")
+    print(f"crawled_pages.json: {json_size / 1024:.1f} KB -> docstore: {store_size / 1024:.1f} KB "
+          f"({json_size / max(store_size, 1):.1f}x smaller)")
+
+if __name__ == "__main__":
+    main()
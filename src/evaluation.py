@@ -1,11 +1,20 @@
+import argparse
+import math
 import time
-from utils import load_json_data
-from search import search_with_ranking
+from concurrent.futures import ProcessPoolExecutor
+from utils import load_json_data, save_json_data, get_data_path
+from search import search_with_ranking, RANKING_MODES
+from docstore import load_documents, get_document_url
+from filters import add_filter_columns
+from instrumentation import latency_summary
+from pagerank import load_topic_pagerank
+
+worker_data = {}
 
 def evaluate_sample_queries():
     print("Loading search engine data...")
     
-    crawled_data = load_json_data('crawled_pages.json')
+    crawled_data = load_documents()
     index_data = load_json_data('inverted_index.json')
     pagerank_scores = load_json_data('pagerank_scores.json')
     link_graph = load_json_data('link_graph.json')
@@ -59,7 +68,7 @@ def evaluate_sample_queries():
         print()
 
 def compare_ranking_methods():
-    crawled_data = load_json_data('crawled_pages.json')
+    crawled_data = load_documents()
     index_data = load_json_data('inverted_index.json')
     pagerank_scores = load_json_data('pagerank_scores.json')
     link_graph = load_json_data('link_graph.json')
@@ -93,8 +102,152 @@ def compare_ranking_methods():
     print("- TF-IDF + PageRank: Incorporates global page authority")
     print("- TF-IDF + HITS: Uses query-specific authority calculation")
 
+def load_judgments(filename):
+    judgments = load_json_data(filename)
+    if not isinstance(judgments, list) or not judgments:
+        raise ValueError(f"{filename} is missing, unreadable or empty; expected a JSON list of "
+                         f"{{query, relevance}} entries")
+    for entry in judgments:
+        if (not isinstance(entry, dict) or not isinstance(entry.get('query'), str)
+                or not isinstance(entry.get('relevance'), dict)):
+            raise ValueError(f"{filename}: every entry needs a 'query' string and a 'relevance' object, "
+                             f"got {entry!r}")
+    return [(entry['query'], entry['relevance']) for entry in judgments]
+
+def dcg(gains):
+    return sum((2 ** gain - 1) / math.log2(rank + 2) for rank, gain in enumerate(gains))
+
+def ndcg_at_k(ranked_urls, relevance, k):
+    ideal = dcg(sorted(relevance.values(), reverse=True)[:k])
+    if ideal == 0:
+        return 0.0
+    return dcg([relevance.get(url, 0) for url in ranked_urls[:k]]) / ideal
+
+def average_precision(ranked_urls, relevance):
+    total_relevant = sum(1 for grade in relevance.values() if grade > 0)
+    if total_relevant == 0:
+        return 0.0
+
+    hits = 0
+    precision_sum = 0.0
+    for rank, url in enumerate(ranked_urls, 1):
+        if relevance.get(url, 0) > 0:
+            hits += 1
+            precision_sum += hits / rank
+    return precision_sum / total_relevant
+
+def reciprocal_rank(ranked_urls, relevance):
+    for rank, url in enumerate(ranked_urls, 1):
+        if relevance.get(url, 0) > 0:
+            return 1.0 / rank
+    return 0.0
+
+def load_search_data():
+    crawled_data = load_documents()
+    index_data = load_json_data('inverted_index.json')
+    if crawled_data and index_data:
+        add_filter_columns(index_data, crawled_data)
+
+    return {
+        'crawled_data': crawled_data,
+        'index_data': index_data,
+        'pagerank_scores': load_json_data('pagerank_scores.json'),
+        'link_graph': load_json_data('link_graph.json'),
+        'topic_pagerank': load_topic_pagerank()
+    }
+
+def init_worker():
+    if not worker_data:
+        worker_data.update(load_search_data())
+
+def run_judged_query(task):
+    query_id, query, ranking_mode, k = task
+    init_worker()
+
+    results = search_with_ranking(query, ranking_mode, worker_data['crawled_data'], worker_data['index_data'],
+                                  worker_data['pagerank_scores'], worker_data['link_graph'],
+                                  worker_data['topic_pagerank'], top_k=k)
+
+    ranked_urls = [get_document_url(worker_data['crawled_data'], doc_id) for doc_id, _ in results]
+    return query_id, ranking_mode, ranked_urls
+
+def time_judged_queries(tasks):
+    latencies = {}
+    for _, query, ranking_mode, k in tasks:
+        start_time = time.perf_counter()
+        search_with_ranking(query, ranking_mode, worker_data['crawled_data'], worker_data['index_data'],
+                            worker_data['pagerank_scores'], worker_data['link_graph'],
+                            worker_data['topic_pagerank'], top_k=k)
+        latencies.setdefault(ranking_mode, []).append(time.perf_counter() - start_time)
+    return latencies
+
+def evaluate_judged_queries(judgments_file, ranking_modes=None, k=10, num_workers=4):
+    judgments = load_judgments(judgments_file)
+    ranking_modes = ranking_modes or list(RANKING_MODES)
+    tasks = [(query_id, query, mode, k) for mode in ranking_modes
+             for query_id, (query, _) in enumerate(judgments)]
+
+    worker_data.update(load_search_data())
+    required = ['crawled_data', 'index_data', 'pagerank_scores', 'link_graph']
+    if not all(worker_data[name] for name in required):
+        print("Missing data files. Please run the complete pipeline first.")
+        return {}
+
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker) as executor:
+        outcomes = list(executor.map(run_judged_query, tasks))
+
+    latencies = time_judged_queries(tasks)
+
+    per_mode = {mode: {'ndcg': [], 'ap': [], 'rr': [], 'latency': latencies.get(mode, [])}
+                for mode in ranking_modes}
+    for query_id, mode, ranked_urls in outcomes:
+        relevance = judgments[query_id][1]
+        per_mode[mode]['ndcg'].append(ndcg_at_k(ranked_urls, relevance, k))
+        per_mode[mode]['ap'].append(average_precision(ranked_urls, relevance))
+        per_mode[mode]['rr'].append(reciprocal_rank(ranked_urls, relevance))
+
+    report = {}
+    for mode, metrics in per_mode.items():
+        num_queries = len(metrics['latency'])
+        report[RANKING_MODES[mode]] = {
+            'queries': num_queries,
+            f'ndcg@{k}': sum(metrics['ndcg']) / num_queries if num_queries else 0.0,
+            'map': sum(metrics['ap']) / num_queries if num_queries else 0.0,
+            'mrr': sum(metrics['rr']) / num_queries if num_queries else 0.0,
+            'latency': latency_summary(metrics['latency']) if num_queries else {}
+        }
+
+    return report
+
+def print_judged_report(report, k):
+    width = max(len('Ranking mode'), *(len(mode_name) for mode_name in report))
+    print(f"{'Ranking mode':<{width}} {f'nDCG@{k}':>8} {'MAP':>8} {'MRR':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    print("-" * (width + 47))
+    for mode_name, metrics in report.items():
+        latency = metrics['latency']
+        print(f"{mode_name:<{width}} {metrics[f'ndcg@{k}']:>8.4f} {metrics['map']:>8.4f} {metrics['mrr']:>8.4f} "
+              f"{latency.get('p50_ms', 0):>9.2f} {latency.get('p99_ms', 0):>9.2f}")
+
 if __name__ == "__main__":
-    print("Starting query evaluation...")
-    evaluate_sample_queries()
-    print("\nDetailed method comparison:")
-    compare_ranking_methods()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Evaluate ranking quality and latency")
+    parser.add_argument('--judgments', help="JSON file of {query, relevance: {url: grade}} entries")
+    parser.add_argument('--modes', nargs='+', choices=list(RANKING_MODES))
+    parser.add_argument('--k', type=int, default=10, help="result depth and metric cutoff")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--output', default=get_data_path('evaluation_results.json'))
+    args = parser.parse_args()
+
+    if args.judgments:
+        try:
+            report = evaluate_judged_queries(args.judgments, args.modes, args.k, args.workers)
+        except ValueError as e:
+            parser.error(str(e))
+        if report:
+            print_judged_report(report, args.k)
+            save_json_data(report, args.output)
+            print(f"\nSaved results to {args.output}")
+    else:
+        print("Starting query evaluation...")
+        evaluate_sample_queries()
+        print("\nDetailed method comparison:")
+        compare_ranking_methods()
\ No newline at end of file
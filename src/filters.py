@@ -0,0 +1,97 @@
+import calendar
+import time
+from indexer import preprocess_text, build_doc_attributes, build_title_index
+
+FILTER_FIELDS = {'site', 'title', 'after', 'before'}
+SECONDS_PER_DAY = 86400
+
+def is_filter_token(token):
+    field, _, value = token.partition(':')
+    return field.lower() in FILTER_FIELDS and bool(value)
+
+def parse_date(value):
+    try:
+        return calendar.timegm(time.strptime(value, '%Y-%m-%d'))
+    except ValueError:
+        return None
+
+def parse_filters(query_text):
+    filters = {'site': [], 'title': [], 'after': None, 'before': None}
+    remaining = []
+
+    for token in query_text.split():
+        if not is_filter_token(token):
+            remaining.append(token)
+            continue
+
+        field, _, value = token.partition(':')
+        field = field.lower()
+        if field == 'site':
+            filters['site'].append(value.lower())
+        elif field == 'title':
+            filters['title'].extend(preprocess_text(value))
+        elif field == 'after':
+            filters['after'] = parse_date(value)
+        else:
+            day_start = parse_date(value)
+            filters['before'] = day_start + SECONDS_PER_DAY if day_start is not None else None
+
+    return ' '.join(remaining), filters
+
+def has_filters(filters):
+    return bool(filters['site'] or filters['title'] or filters['after'] is not None
+                or filters['before'] is not None)
+
+def matching_host_ids(sites, hosts):
+    host_ids = set()
+    for host_id, host in enumerate(hosts):
+        for site in sites:
+            if site.startswith('www.'):
+                site = site[4:]
+            if host == site or host.endswith('.' + site):
+                host_ids.add(host_id)
+    return host_ids
+
+def build_doc_mask(filters, index_data):
+    if not has_filters(filters):
+        return None
+
+    total_docs = index_data['total_documents']
+    attributes = index_data['doc_attributes']
+    mask = bytearray(b'\x01') * total_docs
+
+    if filters['site']:
+        allowed = matching_host_ids(filters['site'], attributes['hosts'])
+        host_ids = attributes['host_ids']
+        for doc_id in range(total_docs):
+            if host_ids[doc_id] not in allowed:
+                mask[doc_id] = 0
+
+    if filters['after'] is not None or filters['before'] is not None:
+        after = filters['after'] if filters['after'] is not None else float('-inf')
+        before = filters['before'] if filters['before'] is not None else float('inf')
+        crawl_timestamps = attributes['crawl_timestamps']
+        for doc_id in range(total_docs):
+            if mask[doc_id] and not after <= crawl_timestamps[doc_id] < before:
+                mask[doc_id] = 0
+
+    if filters['title']:
+        title_index = index_data['title_index']
+        for term in filters['title']:
+            title_mask = bytearray(total_docs)
+            for doc_id in title_index.get(term, []):
+                title_mask[doc_id] = 1
+            for doc_id in range(total_docs):
+                mask[doc_id] &= title_mask[doc_id]
+
+    return mask
+
+def masked_documents(doc_mask):
+    return [doc_id for doc_id, allowed in enumerate(doc_mask) if allowed]
+
+def add_filter_columns(index_data, crawled_data):
+    if 'doc_attributes' not in index_data:
+        index_data['doc_attributes'] = build_doc_attributes(crawled_data)
+    if 'title_index' not in index_data:
+        index_data['title_index'] = build_title_index(crawled_data)
+    return index_data
@@ -1,4 +1,5 @@
 import numpy as np
+import instrumentation
 from utils import load_json_data
 from indexer import preprocess_text
 
@@ -76,29 +77,31 @@ def update_hub_authority_scores(subgraph, hub_scores, auth_scores):
     return new_hub_scores, new_auth_scores
 
 def calculate_hits(query_terms, link_graph, index_data, max_iterations=20):
-    subgraph = extract_query_subgraph(query_terms, link_graph, index_data)
+    with instrumentation.span('hits.subgraph'):
+        subgraph = extract_query_subgraph(query_terms, link_graph, index_data)
     
     if not subgraph['nodes']:
         return {}, {}
     
-    hub_scores = {page: 1.0 for page in subgraph['nodes']}
-    auth_scores = {page: 1.0 for page in subgraph['nodes']}
+    with instrumentation.span('hits.iterate'):
+        hub_scores = {page: 1.0 for page in subgraph['nodes']}
+        auth_scores = {page: 1.0 for page in subgraph['nodes']}
     
-    for iteration in range(max_iterations):
-        new_hub_scores, new_auth_scores = update_hub_authority_scores(subgraph, hub_scores, auth_scores)
+        for iteration in range(max_iterations):
+            new_hub_scores, new_auth_scores = update_hub_authority_scores(subgraph, hub_scores, auth_scores)
         
-        new_hub_scores = normalize_scores(new_hub_scores)
-        new_auth_scores = normalize_scores(new_auth_scores)
+            new_hub_scores = normalize_scores(new_hub_scores)
+            new_auth_scores = normalize_scores(new_auth_scores)
         
-        hub_diff = sum(abs(new_hub_scores.get(p, 0) - hub_scores.get(p, 0)) for p in subgraph['nodes'])
-        auth_diff = sum(abs(new_auth_scores.get(p, 0) - auth_scores.get(p, 0)) for p in subgraph['nodes'])
+            hub_diff = sum(abs(new_hub_scores.get(p, 0) - hub_scores.get(p, 0)) for p in subgraph['nodes'])
+            auth_diff = sum(abs(new_auth_scores.get(p, 0) - auth_scores.get(p, 0)) for p in subgraph['nodes'])
         
-        if hub_diff < 0.0001 and auth_diff < 0.0001:
-            print(f"HITS converged after {iteration + 1} iterations")
-            break
+            if hub_diff < 0.0001 and auth_diff < 0.0001:
+                print(f"HITS converged after {iteration + 1} iterations")
+                break
         
-        hub_scores = new_hub_scores
-        auth_scores = new_auth_scores
+            hub_scores = new_hub_scores
+            auth_scores = new_auth_scores
     
     return hub_scores, auth_scores
 
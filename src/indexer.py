@@ -1,9 +1,14 @@
 import nltk
 import re
+import math
+import calendar
+import time
+from urllib.parse import urlparse
 from collections import defaultdict, Counter
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
-from utils import load_json_data, save_json_data
+import instrumentation
+from utils import save_json_data
 
 def download_nltk_data():
     try:
@@ -11,7 +16,7 @@ def download_nltk_data():
     except LookupError:
         nltk.download('stopwords')
 
-def preprocess_text(text):
+def tokenize_text(text):
     download_nltk_data()
     
     text = text.lower()
@@ -19,23 +24,29 @@ def preprocess_text(text):
     tokens = re.findall(r'\b[a-zA-Z]+\b', text)
     
     stop_words = set(stopwords.words('english'))
-    tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
-    
+    return [token for token in tokens if token not in stop_words and len(token) > 2]
+
+def stem_tokens(tokens):
     stemmer = PorterStemmer()
-    tokens = [stemmer.stem(token) for token in tokens]
-    
-    return tokens
+    return [stemmer.stem(token) for token in tokens]
+
+def preprocess_text(text):
+    return stem_tokens(tokenize_text(text))
 
 def calculate_term_frequencies(tokens):
     return dict(Counter(tokens))
 
-def build_inverted_index(crawled_data):
+def analyze_document(page):
+    with instrumentation.span('indexer.analyze'):
+        return preprocess_text(f"{page['title']} {page['content']}")
+
+def build_inverted_index(crawled_data, doc_id_offset=0, analyzed_documents=None):
     inverted_index = defaultdict(dict)
     document_frequencies = defaultdict(int)
     
-    for doc_id, page in enumerate(crawled_data):
-        full_text = f"{page['title']} {page['content']}"
-        tokens = preprocess_text(full_text)
+    for i, page in enumerate(crawled_data):
+        doc_id = doc_id_offset + i
+        tokens = analyzed_documents[i] if analyzed_documents is not None else analyze_document(page)
         term_frequencies = calculate_term_frequencies(tokens)
         
         unique_terms = set(tokens)
@@ -49,19 +60,141 @@ def build_inverted_index(crawled_data):
                 'title': page['title']
             }
     
-    index_with_df = {
+    with instrumentation.span('indexer.columns'):
+        index_with_df = {
+            'index': dict(inverted_index),
+            'postings': build_postings_lists(inverted_index),
+            'document_frequencies': dict(document_frequencies),
+            'total_documents': len(crawled_data),
+            'doc_attributes': build_doc_attributes(crawled_data),
+            'title_index': build_title_index(crawled_data, doc_id_offset)
+        }
+        index_with_df.update(build_impact_postings(inverted_index, document_frequencies, len(crawled_data)))
+    
+    instrumentation.increment('indexer.documents', len(crawled_data))
+    
+    return index_with_df
+
+def parse_crawl_timestamp(timestamp):
+    try:
+        return calendar.timegm(time.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ'))
+    except (TypeError, ValueError):
+        return 0
+
+def get_host(url):
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+def build_doc_attributes(crawled_data):
+    hosts = []
+    host_to_id = {}
+    host_ids = []
+    crawl_timestamps = []
+    content_lengths = []
+    
+    for page in crawled_data:
+        host = get_host(page['url'])
+        if host not in host_to_id:
+            host_to_id[host] = len(hosts)
+            hosts.append(host)
+        
+        host_ids.append(host_to_id[host])
+        crawl_timestamps.append(parse_crawl_timestamp(page.get('crawl_timestamp')))
+        content_lengths.append(len(page['content']))
+    
+    return {
+        'hosts': hosts,
+        'host_ids': host_ids,
+        'crawl_timestamps': crawl_timestamps,
+        'content_lengths': content_lengths
+    }
+
+def build_title_index(crawled_data, doc_id_offset=0):
+    title_index = defaultdict(list)
+    
+    for i, page in enumerate(crawled_data):
+        doc_id = doc_id_offset + i
+        for term in sorted(set(preprocess_text(page['title']))):
+            title_index[term].append(doc_id)
+    
+    return dict(title_index)
+
+def merge_index_segments(segments):
+    inverted_index = defaultdict(dict)
+    postings = defaultdict(list)
+    document_frequencies = defaultdict(int)
+    title_index = defaultdict(list)
+    doc_attributes = {'hosts': [], 'host_ids': [], 'crawl_timestamps': [], 'content_lengths': []}
+    host_to_id = {}
+    total_documents = 0
+    
+    for segment in segments:
+        for term, term_postings in segment['index'].items():
+            inverted_index[term].update(term_postings)
+        for term, doc_ids in segment['postings'].items():
+            postings[term].extend(doc_ids)
+        for term, df in segment['document_frequencies'].items():
+            document_frequencies[term] += df
+        for term, doc_ids in segment['title_index'].items():
+            title_index[term].extend(doc_ids)
+        
+        attributes = segment['doc_attributes']
+        for host_id in attributes['host_ids']:
+            host = attributes['hosts'][host_id]
+            if host not in host_to_id:
+                host_to_id[host] = len(doc_attributes['hosts'])
+                doc_attributes['hosts'].append(host)
+            doc_attributes['host_ids'].append(host_to_id[host])
+        doc_attributes['crawl_timestamps'].extend(attributes['crawl_timestamps'])
+        doc_attributes['content_lengths'].extend(attributes['content_lengths'])
+        
+        total_documents += segment['total_documents']
+    
+    merged = {
         'index': dict(inverted_index),
+        'postings': dict(postings),
         'document_frequencies': dict(document_frequencies),
-        'total_documents': len(crawled_data)
+        'total_documents': total_documents,
+        'doc_attributes': doc_attributes,
+        'title_index': dict(title_index)
     }
+    merged.update(build_impact_postings(inverted_index, document_frequencies, total_documents))
     
-    return index_with_df
+    return merged
+
+def build_impact_postings(index, document_frequencies, total_documents, impact_levels=255):
+    impact_postings = {}
+    impact_scales = {}
+    
+    for term, postings in index.items():
+        idf = math.log(total_documents / document_frequencies[term]) if total_documents else 0
+        doc_weights = [(int(doc_id), doc_info['tf'] * idf) for doc_id, doc_info in postings.items()]
+        max_weight = max(weight for _, weight in doc_weights)
+        impact_scale = max_weight / impact_levels if max_weight > 0 else 0.0
+        
+        segments = defaultdict(list)
+        for doc_id, weight in doc_weights:
+            impact = max(1, round(weight / impact_scale)) if weight > 0 else 0
+            segments[impact].append(doc_id)
+        
+        impact_postings[term] = [[impact, sorted(segments[impact])]
+                                 for impact in sorted(segments, reverse=True)]
+        impact_scales[term] = impact_scale
+    
+    return {
+        'impact_postings': impact_postings,
+        'impact_scales': impact_scales
+    }
 
 def calculate_document_frequencies(index):
     return {term: len(postings) for term, postings in index.items()}
 
+def build_postings_lists(index):
+    return {term: sorted(int(doc_id) for doc_id in postings) for term, postings in index.items()}
+
 def main():
-    crawled_data = load_json_data('crawled_pages.json')
+    from docstore import load_documents
+    crawled_data = load_documents()
     if not crawled_data:
         print("No crawled data found. Run src/crawler.py first.")
         return
@@ -73,6 +206,14 @@ def main():
     
     print(f"Index built with {len(index_data['index'])} unique terms")
     print(f"Saved to data/inverted_index.json")
+    
+    from suggest import build_suggest_index, save_suggest_index
+    save_suggest_index(build_suggest_index(crawled_data))
+    print(f"Saved autocomplete and spelling data to data/suggest_index.json")
+    
+    if instrumentation.enabled:
+        instrumentation.export_stats('indexer_instrumentation_stats.json')
+        print("Saved instrumentation stats to data/indexer_instrumentation_stats.json")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
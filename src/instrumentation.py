@@ -0,0 +1,157 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from bisect import bisect_left
+import numpy as np
+from utils import save_json_data
+
+HISTOGRAM_BUCKETS_MS = [0.01, 0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000]
+
+enabled = os.environ.get('SEARCH_ENGINE_INSTRUMENT', '') not in ('', '0')
+counters = {}
+histograms = {}
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+class Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record_duration(self.name, time.perf_counter() - self.start)
+        return False
+
+NULL_SPAN = NullSpan()
+
+def enable():
+    global enabled
+    enabled = True
+
+def disable():
+    global enabled
+    enabled = False
+
+def reset():
+    counters.clear()
+    histograms.clear()
+
+def span(name):
+    if not enabled:
+        return NULL_SPAN
+    return Span(name)
+
+def increment(name, value=1):
+    if enabled:
+        counters[name] = counters.get(name, 0) + value
+
+def record_duration(name, seconds):
+    duration_ms = seconds * 1000
+    histogram = histograms.get(name)
+    if histogram is None:
+        histogram = histograms[name] = {
+            'count': 0,
+            'total_ms': 0.0,
+            'min_ms': duration_ms,
+            'max_ms': duration_ms,
+            'buckets': [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        }
+
+    histogram['count'] += 1
+    histogram['total_ms'] += duration_ms
+    histogram['min_ms'] = min(histogram['min_ms'], duration_ms)
+    histogram['max_ms'] = max(histogram['max_ms'], duration_ms)
+    histogram['buckets'][bisect_left(HISTOGRAM_BUCKETS_MS, duration_ms)] += 1
+
+def get_stats():
+    timings = {}
+    for name, histogram in histograms.items():
+        bucket_labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        timings[name] = {
+            'count': histogram['count'],
+            'total_ms': histogram['total_ms'],
+            'mean_ms': histogram['total_ms'] / histogram['count'],
+            'min_ms': histogram['min_ms'],
+            'max_ms': histogram['max_ms'],
+            'histogram': {label: count for label, count in zip(bucket_labels, histogram['buckets']) if count}
+        }
+
+    return {'counters': dict(counters), 'timings': timings}
+
+def export_stats(filename='instrumentation_stats.json'):
+    save_json_data(get_stats(), filename)
+
+def print_stats():
+    stats = get_stats()
+    for name, timing in sorted(stats['timings'].items(), key=lambda item: item[1]['total_ms'], reverse=True):
+        print(f"{name:<30} {timing['count']:>6}x  total {timing['total_ms']:9.3f}ms  "
+              f"mean {timing['mean_ms']:8.3f}ms  max {timing['max_ms']:8.3f}ms")
+    for name, value in sorted(stats['counters'].items()):
+        print(f"{name:<30} {value:>6}")
+
+def latency_summary(latencies):
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'count': len(latencies),
+        'mean_ms': float(np.mean(latencies_ms)),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p90_ms': float(np.percentile(latencies_ms, 90)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'max_ms': float(np.max(latencies_ms))
+    }
+
+def snapshot_stats():
+    return dict(counters), {name: dict(histogram, buckets=list(histogram['buckets']))
+                            for name, histogram in histograms.items()}
+
+def restore_stats(snapshot):
+    saved_counters, saved_histograms = snapshot
+    reset()
+    counters.update(saved_counters)
+    histograms.update(saved_histograms)
+
+def profile_call(func, *args, trace_memory=False, top=20, **kwargs):
+    was_enabled = enabled
+    saved_stats = snapshot_stats()
+    enable()
+    reset()
+
+    if trace_memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+
+    try:
+        profiler.enable()
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        report = {'stages': get_stats()}
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            report['memory_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            report['memory_top'] = [str(stat) for stat in snapshot.statistics('lineno')[:top]]
+            tracemalloc.stop()
+        restore_stats(saved_stats)
+        if not was_enabled:
+            disable()
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(top)
+    report['profile'] = output.getvalue()
+
+    return result, report
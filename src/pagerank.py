@@ -1,5 +1,7 @@
+import os
 import numpy as np
-from utils import load_json_data, save_json_data
+from urllib.parse import urlparse
+from utils import load_json_data, save_json_data, get_data_path
 
 def build_adjacency_matrix(link_graph):
     nodes = link_graph['nodes']
@@ -52,6 +54,154 @@ def calculate_pagerank(link_graph, damping_factor=0.85, max_iterations=30, thres
     
     return scores_dict
 
+TOPIC_DOMAINS = {
+    'kaggle': ['kaggle.com'],
+    'paperswithcode': ['paperswithcode.com'],
+    'huggingface': ['huggingface.co'],
+    'google': ['ai.googleblog.com', 'blog.google', 'research.google'],
+    'arxiv': ['arxiv.org'],
+    'medium': ['towards', 'medium.com']
+}
+
+def url_topic_index(url, topics):
+    host = urlparse(url).netloc.lower()
+    for topic_idx, topic in enumerate(topics):
+        if any(domain in host for domain in TOPIC_DOMAINS[topic]):
+            return topic_idx
+    return None
+
+def build_sparse_transition(link_graph):
+    nodes = link_graph['nodes']
+    url_to_index = {url: i for i, url in enumerate(nodes)}
+    
+    sources = []
+    targets = []
+    for source_url, target_urls in link_graph['edges'].items():
+        if source_url in url_to_index:
+            source_idx = url_to_index[source_url]
+            for target_url in set(target_urls):
+                if target_url in url_to_index:
+                    sources.append(source_idx)
+                    targets.append(url_to_index[target_url])
+    
+    sources = np.array(sources, dtype=np.int64)
+    targets = np.array(targets, dtype=np.int64)
+    out_degree = np.bincount(sources, minlength=len(nodes)).astype(np.float64)
+    weights = 1.0 / out_degree[sources] if len(sources) else np.zeros(0)
+    
+    return sources, targets, weights, out_degree == 0, url_to_index
+
+def calculate_sparse_pagerank(link_graph, damping_factor=0.85, max_iterations=30, threshold=0.0001):
+    nodes = link_graph['nodes']
+    n = len(nodes)
+    sources, targets, weights, dangling, url_to_index = build_sparse_transition(link_graph)
+    pagerank_scores = np.ones(n) / n
+    
+    for iteration in range(max_iterations):
+        propagated = np.bincount(targets, weights=pagerank_scores[sources] * weights, minlength=n)
+        dangling_mass = pagerank_scores[dangling].sum() / n
+        new_scores = (1 - damping_factor) / n + damping_factor * (propagated + dangling_mass)
+        
+        if np.sum(np.abs(new_scores - pagerank_scores)) < threshold:
+            print(f"PageRank converged after {iteration + 1} iterations")
+            break
+        
+        pagerank_scores = new_scores
+    
+    return {url: float(pagerank_scores[i]) for url, i in url_to_index.items()}
+
+def build_teleport_matrix(nodes, topics):
+    n = len(nodes)
+    teleport = np.zeros((n, len(topics)))
+    
+    for node_idx, url in enumerate(nodes):
+        topic_idx = url_topic_index(url, topics)
+        if topic_idx is not None:
+            teleport[node_idx, topic_idx] = 1.0
+    
+    for topic_idx in range(len(topics)):
+        total = teleport[:, topic_idx].sum()
+        if total > 0:
+            teleport[:, topic_idx] /= total
+        else:
+            teleport[:, topic_idx] = 1.0 / n
+    
+    return teleport
+
+def calculate_topic_pageranks(link_graph, topics=None, damping_factor=0.85, max_iterations=50, threshold=0.0001):
+    topics = topics or list(TOPIC_DOMAINS)
+    nodes = link_graph['nodes']
+    n = len(nodes)
+    
+    sources, targets, weights, dangling, url_to_index = build_sparse_transition(link_graph)
+    teleport = build_teleport_matrix(nodes, topics)
+    scores = teleport.copy()
+    
+    for iteration in range(max_iterations):
+        contributions = scores[sources] * weights[:, None]
+        propagated = np.column_stack([
+            np.bincount(targets, weights=contributions[:, topic_idx], minlength=n)
+            for topic_idx in range(len(topics))
+        ])
+        dangling_mass = scores[dangling].sum(axis=0)
+        new_scores = damping_factor * (propagated + teleport * dangling_mass) + (1 - damping_factor) * teleport
+        
+        if np.abs(new_scores - scores).sum(axis=0).max() < threshold:
+            scores = new_scores
+            print(f"Topic PageRank converged after {iteration + 1} iterations")
+            break
+        
+        scores = new_scores
+    
+    return {
+        'topics': topics,
+        'nodes': nodes,
+        'scores': scores.astype(np.float32)
+    }
+
+def save_topic_pagerank(topic_pagerank, filename='topic_pagerank.npz'):
+    np.savez_compressed(get_data_path(filename),
+                        topics=np.array(topic_pagerank['topics']),
+                        nodes=np.array(topic_pagerank['nodes']),
+                        scores=topic_pagerank['scores'])
+
+def load_topic_pagerank(filename='topic_pagerank.npz'):
+    path = get_data_path(filename)
+    if not os.path.exists(path):
+        return {}
+    
+    with np.load(path) as data:
+        nodes = data['nodes'].tolist()
+        return {
+            'topics': data['topics'].tolist(),
+            'nodes': nodes,
+            'url_to_row': {url: i for i, url in enumerate(nodes)},
+            'scores': data['scores']
+        }
+
+def query_topic_weights(candidate_urls, candidate_scores, topic_pagerank):
+    topics = topic_pagerank['topics']
+    weights = np.zeros(len(topics))
+    
+    for url, score in zip(candidate_urls, candidate_scores):
+        topic_idx = url_topic_index(url, topics)
+        if topic_idx is not None:
+            weights[topic_idx] += max(score, 0)
+    
+    total = weights.sum()
+    if total == 0:
+        return np.ones(len(topics)) / len(topics)
+    return weights / total
+
+def blend_topic_pagerank(urls, topic_weights, topic_pagerank):
+    url_to_row = topic_pagerank['url_to_row']
+    rows = np.array([url_to_row.get(url, -1) for url in urls], dtype=np.int64)
+    known = rows >= 0
+    
+    blended = np.zeros(len(urls))
+    blended[known] = topic_pagerank['scores'][rows[known]] @ topic_weights
+    return blended
+
 def main():
     link_graph = load_json_data('link_graph.json')
     if not link_graph:
@@ -60,7 +210,7 @@ def main():
     
     print(f"Calculating PageRank for {len(link_graph['nodes'])} pages...")
     
-    pagerank_scores = calculate_pagerank(link_graph)
+    pagerank_scores = calculate_sparse_pagerank(link_graph)
     save_json_data(pagerank_scores, 'pagerank_scores.json')
     
     print("PageRank calculation completed")
@@ -70,6 +220,10 @@ def main():
     print("\nTop 10 pages by PageRank:")
     for i, (url, score) in enumerate(top_pages, 1):
         print(f"{i}. {url}: {score:.6f}")
+    
+    topic_pagerank = calculate_topic_pageranks(link_graph)
+    save_topic_pagerank(topic_pagerank)
+    print(f"\nSaved {len(topic_pagerank['topics'])} topic-sensitive PageRank vectors to data/topic_pagerank.npz")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,230 @@
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import instrumentation
+from crawler import iter_crawl, build_link_graph, SEED_URLS
+from indexer import analyze_document, build_inverted_index, merge_index_segments
+from pagerank import calculate_sparse_pagerank, calculate_topic_pageranks, save_topic_pagerank
+from docstore import write_docstore
+from utils import get_data_path, load_json_data, save_json_data, create_directory
+
+SENTINEL = None
+SEGMENTS_DIR = get_data_path('segments')
+MANIFEST_PATH = os.path.join(SEGMENTS_DIR, 'manifest.json')
+PAGES_STREAM_PATH = get_data_path('crawled_pages.jsonl')
+LINKS_STREAM_PATH = get_data_path('link_graph.jsonl')
+QUEUE_POLL_INTERVAL = 0.1
+
+def save_json_atomic(data, path):
+    temp_path = path + '.tmp'
+    save_json_data(data, temp_path)
+    os.replace(temp_path, path)
+
+def iter_json_lines(path, limit=None):
+    if not os.path.exists(path):
+        return
+
+    count = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if limit is not None and count >= limit:
+                break
+            line = line.strip()
+            if line:
+                count += 1
+                yield json.loads(line)
+
+def read_json_lines(path, limit=None):
+    return list(iter_json_lines(path, limit))
+
+def record_error(errors, stop_event, error):
+    errors.append(error)
+    stop_event.set()
+
+def put_until_stopped(target_queue, item, stop_event):
+    while not stop_event.is_set():
+        try:
+            target_queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def crawl_stage(seed_urls, page_queue, num_workers, max_pages, max_depth, stop_event, errors):
+    try:
+        with open(LINKS_STREAM_PATH, 'w', encoding='utf-8') as links_file:
+            for page in iter_crawl(seed_urls, max_pages, max_depth):
+                links_file.write(json.dumps({'url': page['url'], 'links': page['links']}) + '\n')
+                links_file.flush()
+                if not put_until_stopped(page_queue, page, stop_event):
+                    break
+    except Exception as e:
+        record_error(errors, stop_event, e)
+    finally:
+        for _ in range(num_workers):
+            put_until_stopped(page_queue, SENTINEL, stop_event)
+
+def analyze_stage(page_queue, analyzed_queue, stop_event, errors):
+    try:
+        while not stop_event.is_set():
+            try:
+                page = page_queue.get(timeout=QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if page is SENTINEL:
+                return
+            if not put_until_stopped(analyzed_queue, (page, analyze_document(page)), stop_event):
+                return
+    except Exception as e:
+        record_error(errors, stop_event, e)
+    finally:
+        put_until_stopped(analyzed_queue, SENTINEL, stop_event)
+
+def index_stage(analyzed_queue, num_workers, segment_size, flush_interval, stats, stop_event, errors):
+    buffer = []
+    manifest = {'segments': [], 'total_documents': 0}
+    workers_done = 0
+
+    try:
+        with open(PAGES_STREAM_PATH, 'w', encoding='utf-8') as pages_file:
+            def flush_segment():
+                pages = [page for page, _ in buffer]
+                tokens = [page_tokens for _, page_tokens in buffer]
+                segment = build_inverted_index(pages, manifest['total_documents'], tokens)
+
+                segment_name = f"segment_{len(manifest['segments']):05d}.json"
+                save_json_data(segment, os.path.join(SEGMENTS_DIR, segment_name))
+                for page in pages:
+                    pages_file.write(json.dumps(page, ensure_ascii=False) + '\n')
+                pages_file.flush()
+
+                manifest['segments'].append(segment_name)
+                manifest['total_documents'] += len(pages)
+                save_json_atomic(manifest, MANIFEST_PATH)
+
+                if stats['first_searchable'] is None:
+                    stats['first_searchable'] = time.time() - stats['start_time']
+                buffer.clear()
+
+            while workers_done < num_workers and not stop_event.is_set():
+                try:
+                    item = analyzed_queue.get(timeout=min(flush_interval, QUEUE_POLL_INTERVAL))
+                except queue.Empty:
+                    if buffer and time.time() - stats['last_item_time'] >= flush_interval:
+                        flush_segment()
+                    continue
+
+                if item is SENTINEL:
+                    workers_done += 1
+                    continue
+
+                stats['last_item_time'] = time.time()
+                buffer.append(item)
+                if len(buffer) >= segment_size:
+                    flush_segment()
+
+            if buffer and not stop_event.is_set():
+                flush_segment()
+    except Exception as e:
+        record_error(errors, stop_event, e)
+
+    stats['documents'] = manifest['total_documents']
+    stats['segments'] = len(manifest['segments'])
+
+def run_pipeline(seed_urls, max_pages=50, max_depth=2, num_workers=2, queue_size=16,
+                 segment_size=10, flush_interval=2.0):
+    create_directory(SEGMENTS_DIR)
+    for name in os.listdir(SEGMENTS_DIR):
+        os.remove(os.path.join(SEGMENTS_DIR, name))
+
+    page_queue = queue.Queue(maxsize=queue_size)
+    analyzed_queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    errors = []
+    stats = {'start_time': time.time(), 'last_item_time': time.time(), 'first_searchable': None}
+
+    threads = [threading.Thread(target=crawl_stage,
+                                args=(seed_urls, page_queue, num_workers, max_pages, max_depth,
+                                      stop_event, errors))]
+    for _ in range(num_workers):
+        threads.append(threading.Thread(target=analyze_stage,
+                                        args=(page_queue, analyzed_queue, stop_event, errors)))
+    threads.append(threading.Thread(target=index_stage,
+                                    args=(analyzed_queue, num_workers, segment_size, flush_interval, stats,
+                                          stop_event, errors)))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    stats['total_time'] = time.time() - stats['start_time']
+    return stats
+
+def load_pipeline_snapshot():
+    manifest = load_json_data(MANIFEST_PATH)
+    if not manifest or not manifest['segments']:
+        return [], {}, {}
+
+    segments = [load_json_data(os.path.join(SEGMENTS_DIR, name)) for name in manifest['segments']]
+    index_data = merge_index_segments(segments)
+    crawled_data = read_json_lines(PAGES_STREAM_PATH, limit=manifest['total_documents'])
+    link_graph = build_link_graph(read_json_lines(LINKS_STREAM_PATH))
+
+    return crawled_data, index_data, link_graph
+
+def finalize_pipeline():
+    manifest = load_json_data(MANIFEST_PATH)
+    if not manifest or not manifest['segments']:
+        return False
+
+    segments = [load_json_data(os.path.join(SEGMENTS_DIR, name)) for name in manifest['segments']]
+    index_data = merge_index_segments(segments)
+    link_graph = build_link_graph(read_json_lines(LINKS_STREAM_PATH))
+
+    write_docstore(iter_json_lines(PAGES_STREAM_PATH, limit=manifest['total_documents']))
+    save_json_data(index_data, 'inverted_index.json')
+    save_json_data(link_graph, 'link_graph.json')
+
+    from suggest import build_suggest_index, save_suggest_index
+    pages = iter_json_lines(PAGES_STREAM_PATH, limit=manifest['total_documents'])
+    save_suggest_index(build_suggest_index(pages))
+    save_json_data(calculate_sparse_pagerank(link_graph), 'pagerank_scores.json')
+    save_topic_pagerank(calculate_topic_pageranks(link_graph))
+
+    remove_pipeline_streams()
+    return True
+
+def remove_pipeline_streams():
+    for path in (PAGES_STREAM_PATH, LINKS_STREAM_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+    shutil.rmtree(SEGMENTS_DIR, ignore_errors=True)
+
+def main():
+    print("Starting streaming crawl -> index pipeline...")
+    stats = run_pipeline(SEED_URLS)
+
+    if stats['first_searchable'] is not None:
+        print(f"First segment searchable after {stats['first_searchable']:.1f}s")
+    print(f"Indexed {stats.get('documents', 0)} documents in {stats.get('segments', 0)} segments "
+          f"({stats['total_time']:.1f}s)")
+
+    if finalize_pipeline():
+        print("Saved document store, index, link graph and PageRank scores to data/")
+    else:
+        print("No pages were crawled.")
+
+    if instrumentation.enabled:
+        instrumentation.export_stats('pipeline_instrumentation_stats.json')
+        print("Saved instrumentation stats to data/pipeline_instrumentation_stats.json")
+
+if __name__ == "__main__":
+    main()
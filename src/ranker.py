@@ -1,7 +1,7 @@
 import math
 from collections import defaultdict
 from utils import load_json_data
-from indexer import preprocess_text
+from indexer import preprocess_text, build_impact_postings
 
 def compute_tf(term, doc_id, index):
     if term in index and doc_id in index[term]:
@@ -14,7 +14,7 @@ def compute_idf(term, document_frequencies, total_docs):
         return math.log(total_docs / df)
     return 0
 
-def calculate_tfidf_scores(query_terms, index_data):
+def calculate_tfidf_scores(query_terms, index_data, doc_mask=None):
     index = index_data['index']
     document_frequencies = index_data['document_frequencies']
     total_docs = index_data['total_documents']
@@ -26,9 +26,13 @@ def calculate_tfidf_scores(query_terms, index_data):
             idf = compute_idf(term, document_frequencies, total_docs)
             
             for doc_id, doc_info in index[term].items():
+                doc_id = int(doc_id)
+                if doc_mask is not None and not doc_mask[doc_id]:
+                    continue
+                
                 tf = doc_info['tf']
                 tfidf_score = tf * idf
-                doc_scores[int(doc_id)] += tfidf_score
+                doc_scores[doc_id] += tfidf_score
     
     return dict(doc_scores)
     
@@ -38,14 +42,131 @@ def rank_documents(scores):
 def process_query(query_text):
     return preprocess_text(query_text)
 
-def search_tfidf(query_text, index_data):
+def search_tfidf(query_text, index_data, doc_mask=None):
     query_terms = process_query(query_text)
     if not query_terms:
         return []
     
-    scores = calculate_tfidf_scores(query_terms, index_data)
+    scores = calculate_tfidf_scores(query_terms, index_data, doc_mask)
     return rank_documents(scores)
 
+def top_k_is_stable(top_docs, k, remaining_impact, quantization_error):
+    if len(top_docs) < k:
+        return False
+    
+    top_scores = sorted(top_docs.values(), reverse=True)
+    next_best = top_scores[k] if len(top_scores) > k else 0
+    return top_scores[k - 1] >= next_best + remaining_impact + 2 * quantization_error
+
+def score_at_a_time(query_terms, index_data, k=10, doc_mask=None, stats=None):
+    if 'impact_postings' not in index_data or 'impact_scales' not in index_data:
+        index_data.update(build_impact_postings(index_data['index'], index_data['document_frequencies'],
+                                                index_data['total_documents']))
+    impact_postings = index_data['impact_postings']
+    impact_scales = index_data['impact_scales']
+    
+    term_segments = [[segment for segment in impact_postings.get(term, []) if segment[0] > 0]
+                     for term in query_terms]
+    term_scales = [impact_scales.get(term, 0.0) for term in query_terms]
+    segments = sorted(((segment[0] * term_scales[term_idx], term_idx, segment_idx)
+                       for term_idx, term_segment_list in enumerate(term_segments)
+                       for segment_idx, segment in enumerate(term_segment_list)), reverse=True)
+    
+    next_impact = [term_segment_list[0][0] if term_segment_list else 0 for term_segment_list in term_segments]
+    quantization_error = sum(term_scales)
+    accumulators = {}
+    top_docs = {}
+    floor_doc = None
+    postings_processed = 0
+    stopped_early = False
+    
+    for contribution, term_idx, segment_idx in segments:
+        remaining_impact = sum(impact * scale for impact, scale in zip(next_impact, term_scales))
+        if top_k_is_stable(top_docs, k, remaining_impact, quantization_error):
+            stopped_early = True
+            break
+        
+        doc_ids = term_segments[term_idx][segment_idx][1]
+        for doc_id in doc_ids:
+            if doc_mask is not None and not doc_mask[doc_id]:
+                continue
+            score = accumulators[doc_id] = accumulators.get(doc_id, 0.0) + contribution
+            
+            if doc_id in top_docs:
+                top_docs[doc_id] = score
+                if doc_id != floor_doc:
+                    continue
+            elif len(top_docs) <= k:
+                top_docs[doc_id] = score
+            elif score > top_docs[floor_doc]:
+                del top_docs[floor_doc]
+                top_docs[doc_id] = score
+            else:
+                continue
+            floor_doc = min(top_docs, key=top_docs.get)
+        postings_processed += len(doc_ids)
+        
+        term_segment_list = term_segments[term_idx]
+        following = term_segment_list[segment_idx + 1][0] if segment_idx + 1 < len(term_segment_list) else 0
+        next_impact[term_idx] = following
+    
+    if stats is not None:
+        stats['postings_processed'] = postings_processed
+        stats['postings_total'] = sum(len(doc_ids) for term in query_terms
+                                      for _, doc_ids in impact_postings.get(term, []))
+        stats['stopped_early'] = stopped_early
+    
+    if len(accumulators) < k:
+        return list(accumulators) + zero_impact_docs(query_terms, impact_postings, accumulators,
+                                                     k - len(accumulators), doc_mask)
+    
+    remaining_impact = sum(impact * scale for impact, scale in zip(next_impact, term_scales))
+    kth_score = sorted(top_docs.values(), reverse=True)[k - 1]
+    threshold = kth_score - remaining_impact - 2 * quantization_error
+    pool = top_docs if len(top_docs) > k and top_docs[floor_doc] < threshold else accumulators
+    return [doc_id for doc_id, score in pool.items() if score >= threshold]
+
+def zero_impact_docs(query_terms, impact_postings, scored_docs, limit, doc_mask=None):
+    seen = set(scored_docs)
+    docs = []
+    for term in query_terms:
+        for impact, doc_ids in impact_postings.get(term, []):
+            if impact > 0:
+                continue
+            for doc_id in doc_ids:
+                if doc_id in seen or (doc_mask is not None and not doc_mask[doc_id]):
+                    continue
+                seen.add(doc_id)
+                docs.append(doc_id)
+                if len(docs) == limit:
+                    return docs
+    return docs
+
+def search_impact(query_text, index_data, k=10, doc_mask=None, stats=None):
+    query_terms = process_query(query_text)
+    if not query_terms:
+        return []
+    
+    candidate_docs = score_at_a_time(query_terms, index_data, k, doc_mask, stats)
+    
+    index = index_data['index']
+    document_frequencies = index_data['document_frequencies']
+    total_docs = index_data['total_documents']
+    
+    doc_scores = {}
+    for doc_id in candidate_docs:
+        score = 0.0
+        for term in query_terms:
+            if term in index:
+                doc_info = index[term].get(str(doc_id)) or index[term].get(doc_id)
+                if doc_info:
+                    score += doc_info['tf'] * compute_idf(term, document_frequencies, total_docs)
+        doc_scores[doc_id] = score
+    
+    if stats is not None:
+        stats['candidates'] = len(candidate_docs)
+    return rank_documents(doc_scores)[:k]
+
 def main():
     index_data = load_json_data('inverted_index.json')
     if not index_data:
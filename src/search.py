@@ -1,15 +1,40 @@
 import time
+import instrumentation
 from utils import load_json_data
-from ranker import search_tfidf, process_query
+from docstore import load_documents, get_document_url
+from ranker import search_tfidf, search_impact, process_query
 from hits import calculate_hits
+from pagerank import load_topic_pagerank, query_topic_weights, blend_topic_pagerank
+from boolean_query import is_boolean_query, search_boolean, parse_query, collect_query_terms
+from suggest import load_suggest_index, correct_query
+from filters import parse_filters, build_doc_mask, masked_documents, is_filter_token, add_filter_columns
+
+RANKING_MODES = {
+    '1': 'TF-IDF',
+    '2': 'TF-IDF + PageRank',
+    '3': 'TF-IDF + HITS Authority',
+    '4': 'TF-IDF + Topic PageRank',
+    '5': 'TF-IDF (impact-ordered, early termination)'
+}
+
+TOPIC_CANDIDATES = 20
 
 def main_search_loop():
     print("Loading search engine data...")
     
-    crawled_data = load_json_data('crawled_pages.json')
+    crawled_data = load_documents()
     index_data = load_json_data('inverted_index.json')
     pagerank_scores = load_json_data('pagerank_scores.json')
     link_graph = load_json_data('link_graph.json')
+    suggest_data = load_suggest_index()
+    topic_pagerank = load_topic_pagerank()
+    
+    if not crawled_data and not index_data:
+        from pipeline import load_pipeline_snapshot
+        crawled_data, index_data, link_graph = load_pipeline_snapshot()
+        if index_data:
+            print(f"Using partial index from the streaming pipeline ({len(crawled_data)} documents)")
+            pagerank_scores = pagerank_scores or {url: 0 for url in link_graph['nodes']}
     
     if not all([crawled_data, index_data, pagerank_scores, link_graph]):
         print("Missing data files. Please run:")
@@ -18,11 +43,18 @@ def main_search_loop():
         print("3. python src/pagerank.py")
         return
     
+    add_filter_columns(index_data, crawled_data)
+    
     print("Search engine ready!")
     print("\nRanking options:")
     print("1. TF-IDF only")
     print("2. TF-IDF + PageRank")
     print("3. TF-IDF + HITS Authority")
+    print("4. TF-IDF + Topic PageRank")
+    print("5. TF-IDF, impact-ordered with early termination")
+    print("Boolean queries are supported, e.g. (deep OR neural) AND NOT vision")
+    print("Filters: site:arxiv.org title:transformer after:2025-01-01 before:2025-12-31")
+    print("Prefix a query with 'profile:' for a cProfile/tracemalloc breakdown")
     
     while True:
         print("\n" + "="*50)
@@ -30,93 +62,169 @@ def main_search_loop():
         if query.lower() == 'quit':
             break
         
-        ranking_mode = input("Select ranking mode (1-3): ").strip()
-        if ranking_mode not in ['1', '2', '3']:
+        profile = query.startswith('profile:')
+        if profile:
+            query = query[len('profile:'):].strip()
+        
+        ranking_mode = input(f"Select ranking mode (1-{len(RANKING_MODES)}): ").strip()
+        if ranking_mode not in RANKING_MODES:
             print("Invalid ranking mode. Using TF-IDF only.")
             ranking_mode = '1'
         
+        if profile:
+            profile_query(query, ranking_mode, crawled_data, index_data, pagerank_scores, link_graph,
+                          topic_pagerank)
+            continue
+        
         start_time = time.time()
         results = search_with_ranking(query, ranking_mode, crawled_data, index_data, 
-                                    pagerank_scores, link_graph)
+                                    pagerank_scores, link_graph, topic_pagerank)
+        
+        if not results and suggest_data and not is_boolean_query(query):
+            text, _ = parse_filters(query)
+            correction = correct_query(text, suggest_data)
+            if correction:
+                filter_tokens = [token for token in query.split() if is_filter_token(token)]
+                correction = ' '.join([correction] + filter_tokens)
+                print(f"\nNo results for '{query}'. Showing results for '{correction}' instead.")
+                query = correction
+                results = search_with_ranking(query, ranking_mode, crawled_data, index_data,
+                                            pagerank_scores, link_graph, topic_pagerank)
         search_time = time.time() - start_time
         
-        display_results(results, query, ranking_mode, search_time)
+        display_results(results, query, ranking_mode, search_time, crawled_data)
+        
+        if instrumentation.enabled:
+            print("Stage timings (cumulative):")
+            instrumentation.print_stats()
+    
+    if instrumentation.enabled:
+        instrumentation.export_stats()
+        print("Saved instrumentation stats to data/instrumentation_stats.json")
+
+def profile_query(query, ranking_mode, crawled_data, index_data, pagerank_scores, link_graph,
+                  topic_pagerank=None):
+    results, report = instrumentation.profile_call(
+        search_with_ranking, query, ranking_mode, crawled_data, index_data,
+        pagerank_scores, link_graph, topic_pagerank, trace_memory=True)
+    
+    print(f"\nProfile for '{query}' ({len(results)} results)")
+    print(report['profile'])
+    print(f"Peak traced memory: {report['memory_peak_bytes'] / 1024:.1f} KB")
+    for name, timing in report['stages']['timings'].items():
+        print(f"{name:<30} {timing['total_ms']:9.3f}ms")
 
 def process_query(query_text):
     from indexer import preprocess_text
     return preprocess_text(query_text)
 
-def search_with_ranking(query, ranking_mode, crawled_data, index_data, pagerank_scores, link_graph):
-    query_terms = process_query(query)
-    if not query_terms:
-        return []
-    
-    tfidf_results = search_tfidf(query, index_data)
-    
-    if ranking_mode == '1':
-        return tfidf_results[:10]
-    
-    elif ranking_mode == '2':
-        return combine_tfidf_pagerank(tfidf_results, pagerank_scores, crawled_data)
-    
-    elif ranking_mode == '3':
-        return combine_tfidf_hits(query_terms, tfidf_results, link_graph, index_data, crawled_data)
-    
-    return tfidf_results[:10]
+def search_with_ranking(query, ranking_mode, crawled_data, index_data, pagerank_scores, link_graph,
+                        topic_pagerank=None, top_k=10):
+    instrumentation.increment('search.queries')
+    
+    with instrumentation.span('search.filters'):
+        query, filters = parse_filters(query)
+        doc_mask = build_doc_mask(filters, index_data)
+    
+    if is_boolean_query(query):
+        with instrumentation.span('search.preprocess'):
+            query_terms = collect_query_terms(parse_query(query))
+        with instrumentation.span('search.scoring'):
+            tfidf_results = search_boolean(query, index_data, doc_mask=doc_mask)
+    else:
+        with instrumentation.span('search.preprocess'):
+            query_terms = process_query(query)
+        with instrumentation.span('search.scoring'):
+            if query_terms and ranking_mode == '5':
+                tfidf_results = search_impact(query, index_data, k=top_k, doc_mask=doc_mask)
+            elif query_terms:
+                tfidf_results = search_tfidf(query, index_data, doc_mask)
+            elif doc_mask is not None:
+                tfidf_results = [(doc_id, 0.0) for doc_id in masked_documents(doc_mask)]
+            else:
+                return []
+    
+    instrumentation.increment('search.candidates', len(tfidf_results))
+    
+    with instrumentation.span('search.combine'):
+        if ranking_mode == '1':
+            return tfidf_results[:top_k]
+        
+        elif ranking_mode == '2':
+            return combine_tfidf_pagerank(tfidf_results, pagerank_scores, crawled_data, top_k)
+        
+        elif ranking_mode == '3':
+            return combine_tfidf_hits(query_terms, tfidf_results, link_graph, index_data, crawled_data, top_k)
+        
+        elif ranking_mode == '4':
+            return combine_tfidf_topic_pagerank(tfidf_results, topic_pagerank, crawled_data, top_k)
+        
+        return tfidf_results[:top_k]
 
-def combine_tfidf_pagerank(tfidf_results, pagerank_scores, crawled_data):
+def combine_tfidf_pagerank(tfidf_results, pagerank_scores, crawled_data, top_k=10):
     combined_scores = []
     
     for doc_id, tfidf_score in tfidf_results:
         if doc_id < len(crawled_data):
-            url = crawled_data[doc_id]['url']
+            url = get_document_url(crawled_data, doc_id)
             pagerank_score = pagerank_scores.get(url, 0)
             
             combined_score = 0.6 * tfidf_score + 0.4 * pagerank_score
             combined_scores.append((doc_id, combined_score))
     
-    return sorted(combined_scores, key=lambda x: x[1], reverse=True)[:10]
+    return sorted(combined_scores, key=lambda x: x[1], reverse=True)[:top_k]
 
-def combine_tfidf_hits(query_terms, tfidf_results, link_graph, index_data, crawled_data):
+def combine_tfidf_hits(query_terms, tfidf_results, link_graph, index_data, crawled_data, top_k=10):
     hub_scores, auth_scores = calculate_hits(query_terms, link_graph, index_data)
     
     combined_scores = []
     
     for doc_id, tfidf_score in tfidf_results:
         if doc_id < len(crawled_data):
-            url = crawled_data[doc_id]['url']
+            url = get_document_url(crawled_data, doc_id)
             authority_score = auth_scores.get(url, 0)
             
             combined_score = 0.6 * tfidf_score + 0.4 * authority_score
             combined_scores.append((doc_id, combined_score))
     
-    return sorted(combined_scores, key=lambda x: x[1], reverse=True)[:10]
+    return sorted(combined_scores, key=lambda x: x[1], reverse=True)[:top_k]
+
+def combine_tfidf_topic_pagerank(tfidf_results, topic_pagerank, crawled_data, top_k=10):
+    if not topic_pagerank:
+        return tfidf_results[:top_k]
+    
+    tfidf_results = [(doc_id, score) for doc_id, score in tfidf_results if doc_id < len(crawled_data)]
+    urls = [get_document_url(crawled_data, doc_id) for doc_id, _ in tfidf_results]
+    scores = [score for _, score in tfidf_results]
+    
+    topic_weights = query_topic_weights(urls[:TOPIC_CANDIDATES], scores[:TOPIC_CANDIDATES], topic_pagerank)
+    topic_scores = blend_topic_pagerank(urls, topic_weights, topic_pagerank)
+    
+    combined_scores = [(doc_id, 0.6 * tfidf_score + 0.4 * float(topic_score))
+                       for (doc_id, tfidf_score), topic_score in zip(tfidf_results, topic_scores)]
+    
+    return sorted(combined_scores, key=lambda x: x[1], reverse=True)[:top_k]
 
 def format_results(results, crawled_data):
     formatted = []
     
-    for doc_id, score in results:
-        if doc_id < len(crawled_data):
-            page = crawled_data[doc_id]
-            snippet = page['content'][:200] + "..." if len(page['content']) > 200 else page['content']
-            
-            formatted.append({
-                'title': page['title'],
-                'url': page['url'],
-                'snippet': snippet,
-                'score': score
-            })
+    with instrumentation.span('search.format'):
+        for doc_id, score in results:
+            if doc_id < len(crawled_data):
+                page = crawled_data[doc_id]
+                snippet = page['content'][:200] + "..." if len(page['content']) > 200 else page['content']
+                
+                formatted.append({
+                    'title': page['title'],
+                    'url': page['url'],
+                    'snippet': snippet,
+                    'score': score
+                })
     
     return formatted
 
-def display_results(results, query, ranking_mode, search_time):
-    ranking_names = {
-        '1': 'TF-IDF',
-        '2': 'TF-IDF + PageRank', 
-        '3': 'TF-IDF + HITS Authority'
-    }
-    
-    print(f"\nResults for '{query}' using {ranking_names[ranking_mode]}")
+def display_results(results, query, ranking_mode, search_time, crawled_data=None):
+    print(f"\nResults for '{query}' using {RANKING_MODES[ranking_mode]}")
     print(f"Search completed in {search_time:.3f} seconds")
     print("-" * 80)
     
@@ -124,7 +232,8 @@ def display_results(results, query, ranking_mode, search_time):
         print("No results found.")
         return
     
-    crawled_data = load_json_data('crawled_pages.json')
+    if crawled_data is None:
+        crawled_data = load_documents()
     formatted_results = format_results(results, crawled_data)
     
     for i, result in enumerate(formatted_results, 1):
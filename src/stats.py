@@ -1,7 +1,8 @@
 from utils import load_json_data
+from docstore import load_documents
 
 def generate_statistics():
-    crawled_data = load_json_data('crawled_pages.json')
+    crawled_data = load_documents()
     index_data = load_json_data('inverted_index.json')
     link_graph = load_json_data('link_graph.json')
     
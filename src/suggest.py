@@ -0,0 +1,175 @@
+import heapq
+from bisect import bisect_left
+from itertools import combinations
+from utils import load_json_data, save_json_data
+from indexer import tokenize_text, stem_tokens
+from docstore import load_documents
+
+MAX_EDIT_DISTANCE = 2
+
+def generate_deletes(term, max_distance=MAX_EDIT_DISTANCE):
+    deletes = {term}
+    for distance in range(1, min(max_distance, len(term)) + 1):
+        for positions in combinations(range(len(term)), distance):
+            deletes.add(''.join(char for i, char in enumerate(term) if i not in positions))
+    return deletes
+
+def collect_surface_forms(crawled_data):
+    frequencies = {}
+    for page in crawled_data:
+        for token in set(tokenize_text(f"{page['title']} {page['content']}")):
+            frequencies[token] = frequencies.get(token, 0) + 1
+    return frequencies
+
+def build_suggest_index(crawled_data, max_distance=MAX_EDIT_DISTANCE):
+    surface_frequencies = collect_surface_forms(crawled_data)
+    terms = sorted(surface_frequencies)
+    frequencies = [surface_frequencies[term] for term in terms]
+
+    deletes = {}
+    for term_id, term in enumerate(terms):
+        for variant in generate_deletes(term, max_distance):
+            deletes.setdefault(variant, []).append(term_id)
+
+    delete_keys = sorted(deletes)
+    delete_offsets = [0]
+    delete_term_ids = []
+    for variant in delete_keys:
+        delete_term_ids.extend(deletes[variant])
+        delete_offsets.append(len(delete_term_ids))
+
+    return {
+        'terms': terms,
+        'frequencies': frequencies,
+        'stems': stem_tokens(terms),
+        'delete_keys': delete_keys,
+        'delete_offsets': delete_offsets,
+        'delete_term_ids': delete_term_ids,
+        'max_edit_distance': max_distance
+    }
+
+def save_suggest_index(suggest_data, filename='suggest_index.json'):
+    save_json_data(suggest_data, filename, compact=True)
+
+def load_suggest_index(filename='suggest_index.json'):
+    suggest_data = load_json_data(filename)
+    if suggest_data:
+        suggest_data['term_ids'] = {term: i for i, term in enumerate(suggest_data['terms'])}
+        suggest_data['known_stems'] = set(suggest_data['stems'])
+    return suggest_data
+
+def lookup_deletes(variant, suggest_data):
+    delete_keys = suggest_data['delete_keys']
+    position = bisect_left(delete_keys, variant)
+    if position == len(delete_keys) or delete_keys[position] != variant:
+        return []
+
+    offsets = suggest_data['delete_offsets']
+    return suggest_data['delete_term_ids'][offsets[position]:offsets[position + 1]]
+
+def complete_prefix(prefix, suggest_data, k=5):
+    terms = suggest_data['terms']
+    frequencies = suggest_data['frequencies']
+
+    prefix = prefix.lower()
+    start = bisect_left(terms, prefix)
+    end = bisect_left(terms, prefix + '\uffff', lo=start)
+
+    top_ids = heapq.nlargest(k, range(start, end), key=lambda term_id: frequencies[term_id])
+    return [(terms[term_id], frequencies[term_id]) for term_id in top_ids]
+
+def edit_distance(source, target, max_distance):
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        previous_previous, previous = previous, current
+
+    return previous[-1]
+
+def correct_term(term, suggest_data):
+    terms = suggest_data['terms']
+    frequencies = suggest_data['frequencies']
+    max_distance = suggest_data['max_edit_distance']
+
+    term_ids = suggest_data.get('term_ids')
+    if term_ids is None:
+        term_ids = suggest_data['term_ids'] = {t: i for i, t in enumerate(terms)}
+    if term in term_ids:
+        return term
+
+    best = None
+    seen = set()
+    for variant in generate_deletes(term, max_distance):
+        for term_id in lookup_deletes(variant, suggest_data):
+            if term_id in seen:
+                continue
+            seen.add(term_id)
+
+            distance = edit_distance(term, terms[term_id], max_distance)
+            if distance > max_distance:
+                continue
+
+            candidate = (distance, -frequencies[term_id], terms[term_id])
+            if best is None or candidate < best:
+                best = candidate
+
+    return best[2] if best else None
+
+def correct_query(query_text, suggest_data):
+    known_stems = suggest_data.get('known_stems')
+    if known_stems is None:
+        known_stems = suggest_data['known_stems'] = set(suggest_data['stems'])
+
+    words = tokenize_text(query_text)
+    corrected_words = []
+    changed = False
+
+    for word, stem in zip(words, stem_tokens(words)):
+        corrected = word if stem in known_stems else correct_term(word, suggest_data)
+        if corrected is None:
+            corrected = word
+        changed = changed or corrected != word
+        corrected_words.append(corrected)
+
+    return ' '.join(corrected_words) if changed else None
+
+def main():
+    suggest_data = load_suggest_index()
+    if not suggest_data:
+        crawled_data = load_documents()
+        if not crawled_data:
+            print("No crawled data found. Run src/crawler.py first.")
+            return
+
+        save_suggest_index(build_suggest_index(crawled_data))
+        suggest_data = load_suggest_index()
+        print(f"Suggest index built with {len(suggest_data['terms'])} terms")
+
+    while True:
+        query = input("\nEnter partial or misspelled query (or 'quit' to exit): ").strip()
+        if query.lower() == 'quit':
+            break
+
+        words = query.split()
+        if words:
+            print("Completions:")
+            for term, df in complete_prefix(words[-1], suggest_data):
+                print(f"  {term} ({df} docs)")
+
+        correction = correct_query(query, suggest_data)
+        if correction:
+            print(f"Did you mean: {correction}")
+
+if __name__ == "__main__":
+    main()
@@ -23,13 +23,16 @@ def load_json_data(filename):
     except json.JSONDecodeError:
         return {}
 
-def save_json_data(data, filename):
+def save_json_data(data, filename, compact=False):
     if os.sep not in filename and '/' not in filename:
         filename = get_data_path(filename)
     
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        if compact:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
 def normalize_url(url, base_url):
     if not url:
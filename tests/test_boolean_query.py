@@ -0,0 +1,84 @@
+import json
+import random
+import re
+import pytest
+import indexer
+from indexer import build_inverted_index, build_postings_lists
+from boolean_query import (parse_query, search_boolean, intersect_postings, union_postings,
+                           difference_postings)
+
+VOCABULARY = ['common', 'frequent', 'model', 'neural', 'vision', 'language', 'graph', 'robot',
+              'kernel', 'tensor', 'bayes', 'markov', 'sparse', 'gradient', 'token', 'pixel']
+
+def simple_tokenize(text):
+    return [token for token in re.findall(r'[a-z]+', text.lower()) if len(token) > 2]
+
+@pytest.fixture(autouse=True)
+def plain_tokenizer(monkeypatch):
+    monkeypatch.setattr(indexer, 'tokenize_text', simple_tokenize)
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(7)
+    weights = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+    pages = []
+    for doc_id in range(300):
+        words = rng.choices(VOCABULARY, weights=weights, k=rng.randint(5, 40))
+        if doc_id % 50:
+            words.append('common')
+        pages.append({
+            'url': f"https://example.com/{doc_id}",
+            'title': '',
+            'content': ' '.join(words),
+            'crawl_timestamp': '2025-01-01T00:00:00Z'
+        })
+
+    index_data = json.loads(json.dumps(build_inverted_index(pages)))
+    doc_words = [set(page['content'].split()) for page in pages]
+    return index_data, doc_words
+
+def test_postings_merges_match_set_operations():
+    rng = random.Random(1)
+    for _ in range(200):
+        p1 = sorted(rng.sample(range(1000), rng.randint(0, 300)))
+        p2 = sorted(rng.sample(range(1000), rng.randint(0, 300)))
+        stats = {'postings_touched': 0}
+        assert intersect_postings(p1, p2, stats) == sorted(set(p1) & set(p2))
+        assert union_postings(p1, p2, stats) == sorted(set(p1) | set(p2))
+        assert difference_postings(p1, p2, stats) == sorted(set(p1) - set(p2))
+
+@pytest.mark.parametrize('query, expected', [
+    ('model ) OR vision', 'model OR vision'),
+    ('model AND OR vision', 'model OR vision'),
+    ('model OR AND vision', 'model OR vision'),
+    ('OR model', 'model'),
+    ('model AND', 'model'),
+    ('( model OR vision ) ) graph', '( model OR vision ) graph'),
+    ('( model OR vision', '( model OR vision )'),
+])
+def test_malformed_queries_keep_their_operators(query, expected):
+    assert parse_query(query) == parse_query(expected)
+
+@pytest.mark.parametrize('query, predicate', [
+    ('model AND vision', lambda words: 'model' in words and 'vision' in words),
+    ('model vision', lambda words: 'model' in words and 'vision' in words),
+    ('graph OR robot', lambda words: 'graph' in words or 'robot' in words),
+    ('graph ) OR robot', lambda words: 'graph' in words or 'robot' in words),
+    ('common AND NOT model', lambda words: 'common' in words and 'model' not in words),
+    ('NOT common', lambda words: 'common' not in words),
+    ('(neural OR tensor) AND NOT (vision OR pixel)',
+     lambda words: ('neural' in words or 'tensor' in words) and not ('vision' in words or 'pixel' in words)),
+    ('common AND frequent AND model AND token',
+     lambda words: {'common', 'frequent', 'model', 'token'} <= words),
+])
+def test_boolean_query_matches_brute_force(corpus, query, predicate):
+    index_data, doc_words = corpus
+    expected = {doc_id for doc_id, words in enumerate(doc_words) if predicate(words)}
+    assert {doc_id for doc_id, _ in search_boolean(query, index_data)} == expected
+
+def test_skip_pointers_touch_fewer_postings(corpus):
+    index_data, _ = corpus
+    stats = {}
+    search_boolean('common AND markov', index_data, stats)
+    postings = build_postings_lists(index_data['index'])
+    assert stats['postings_touched'] < len(postings['common']) + len(postings['markov'])
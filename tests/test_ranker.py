@@ -0,0 +1,87 @@
+import itertools
+import json
+import random
+import re
+import pytest
+import indexer
+from indexer import build_inverted_index
+from ranker import search_tfidf, search_impact
+
+VOCABULARY = ['common', 'frequent', 'model', 'neural', 'vision', 'language', 'graph', 'robot',
+              'kernel', 'tensor', 'bayes', 'markov', 'sparse', 'gradient', 'token', 'pixel']
+
+def simple_tokenize(text):
+    return [token for token in re.findall(r'[a-z]+', text.lower()) if len(token) > 2]
+
+@pytest.fixture(autouse=True)
+def plain_tokenizer(monkeypatch):
+    monkeypatch.setattr(indexer, 'tokenize_text', simple_tokenize)
+
+def make_corpus(num_docs=300, seed=7):
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+    pages = []
+    for doc_id in range(num_docs):
+        words = rng.choices(VOCABULARY, weights=weights, k=rng.randint(5, 40))
+        if doc_id % 50:
+            words.append('common')
+        pages.append({
+            'url': f"https://example.com/{doc_id}",
+            'title': '',
+            'content': ' '.join(words),
+            'crawl_timestamp': '2025-01-01T00:00:00Z'
+        })
+    return pages
+
+@pytest.fixture
+def corpus():
+    pages = make_corpus()
+    return pages, json.loads(json.dumps(build_inverted_index(pages)))
+
+def top_scores(results, k):
+    return [round(score, 9) for _, score in results[:k]]
+
+@pytest.mark.parametrize('k', [1, 5, 10])
+def test_impact_search_matches_exhaustive_tfidf(corpus, k):
+    _, index_data = corpus
+    queries = VOCABULARY + [' '.join(pair) for pair in itertools.combinations(VOCABULARY, 2)]
+    stopped_early = 0
+    for query in queries:
+        stats = {}
+        results = search_impact(query, index_data, k, stats=stats)
+        stopped_early += stats['stopped_early']
+        assert top_scores(results, k) == top_scores(search_tfidf(query, index_data), k)
+    assert stopped_early > 0
+
+def test_impact_search_respects_doc_mask(corpus):
+    pages, index_data = corpus
+    doc_mask = bytearray(doc_id % 3 == 0 for doc_id in range(len(pages)))
+    for query in ['common', 'model vision', 'frequent token graph']:
+        exhaustive = search_tfidf(query, index_data, doc_mask)
+        results = search_impact(query, index_data, 10, doc_mask)
+        assert all(doc_mask[doc_id] for doc_id, _ in results)
+        assert top_scores(results, 10) == top_scores(exhaustive, 10)
+
+def make_sparse_corpus(rng, num_docs, num_terms, docs_per_term):
+    contents = [[] for _ in range(num_docs)]
+    for term_id in range(num_terms):
+        term = 'term' + ''.join(chr(ord('a') + int(digit)) for digit in str(term_id))
+        for doc_id in rng.sample(range(num_docs), docs_per_term):
+            contents[doc_id].extend([term] * rng.randint(1, 25))
+    for doc_words in contents:
+        doc_words.append('everywhere')
+    return [{'url': f"https://example.com/{doc_id}", 'title': '', 'content': ' '.join(doc_words),
+             'crawl_timestamp': '2025-01-01T00:00:00Z'} for doc_id, doc_words in enumerate(contents)]
+
+@pytest.mark.parametrize('seed', range(12))
+def test_impact_search_matches_exhaustive_tfidf_on_random_corpora(seed):
+    rng = random.Random(seed)
+    pages = make_sparse_corpus(rng, rng.choice([20, 40, 80]), 30, 10)
+    index_data = json.loads(json.dumps(build_inverted_index(pages)))
+    terms = sorted(index_data['index'])
+
+    queries = [' '.join(rng.sample(terms, rng.randint(1, 4))) for _ in range(150)]
+    for query in queries:
+        for k in (1, 5, 10, 15):
+            assert (top_scores(search_impact(query, index_data, k), k)
+                    == top_scores(search_tfidf(query, index_data), k)), (seed, query, k)